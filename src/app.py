@@ -2,11 +2,13 @@
 import settings
 import gradio as gr
 
+from pathlib import Path
+from functools import lru_cache
 from gradio_modal import Modal
 from utils.process_memory import clear_long_term_memory
-from utils.process_knowledge import upload_file_to_base_knowledge
+from utils.process_knowledge import upload_file_to_base_knowledge, check_upload_status
 from utils.process_chat import get_response, stop_agent_running_stream
-from utils.model_dropdown import get_owners_to_models, update_model_name_dropdown, get_full_model_name
+from utils.model_dropdown import get_owners, get_owners_to_models, update_model_name_dropdown, get_full_model_name
 from utils.process_session import (
     get_unique_session_id,
     clear_and_start_new_session,
@@ -20,23 +22,42 @@ from utils.process_session import (
 user_avatar = "./assets/images/user_avatar.jpg"
 bot_avatar = "./assets/images/bot_avatar.gif"
 
-# Read CSS
-with open("./assets/custom_style.css", "r") as f:
-    custom_css = f.read()
-    
+
+@lru_cache(maxsize=1)
+def load_custom_css() -> str:
+    """Read the custom CSS file once"""
+    return Path("./assets/custom_style.css").read_text(encoding="utf-8")
+
+
+# Process list of unique proprietary models
+owner_to_models = get_owners_to_models()
+owners = list(get_owners())
+
+# Precomputed full model names by owner and model name
+model_full_names = {
+    owner: {model: get_full_model_name(owner, model) for model in models}
+    for owner, models in owner_to_models.items()
+}
+
+# Precomputed default full model name by owner
+owner_default_models = {
+    owner: model_full_names[owner][models[0]]
+    for owner, models in owner_to_models.items()
+}
+
 
 with gr.Blocks(
     title="WebChat",
-    css=custom_css,
+    css=load_custom_css(),
     fill_width=True,
 ) as demo:
     # States variables
     unique_session_id = gr.State(value=get_unique_session_id())
     username = gr.State() 
     
-    # Process list of unique proprietary models
-    owner_to_models = get_owners_to_models()
-    owners = list(owner_to_models.keys())
+    # Polls the background knowledge upload until it ends
+    upload_status_timer = gr.Timer(value=2, active=False)
+    
     full_model_name = gr.State(value=f"{owners[0]}_{owner_to_models[owners[0]][0]}") 
   
     with gr.Row():
@@ -372,8 +393,9 @@ with gr.Blocks(
        
     # Handlers
     #
-    # Latex radio mode
-    latex_mode_radio.change(
+    # Session radio selection, Latex radio mode and chat event metadata radio button
+    gr.on(
+        triggers=[session_radio.change, latex_mode_radio.change, chat_event_metadata_radio.change],
         fn=load_sessions_history,
         inputs=[session_radio, username, chat_event_metadata_radio, latex_mode_radio],
         outputs=[chatbot, chatbot],
@@ -382,20 +404,12 @@ with gr.Blocks(
     #
     # Updates selection to ensure only 1 or none
     chat_event_reasoning.change(
-        fn=lambda selected: [selected[-1]] if selected and len(selected) > 1 else selected,
+        fn=lambda selected: [selected[-1]] if selected and len(selected) > 1 else gr.update(),
         inputs=chat_event_reasoning,
         outputs=chat_event_reasoning,
         show_progress="hidden"
     )
     #
-    # Chat event metadata radio button
-    chat_event_metadata_radio.change(
-        fn=load_sessions_history,
-        inputs=[session_radio, username, chat_event_metadata_radio, latex_mode_radio],
-        outputs=[chatbot, chatbot],
-        show_progress="hidden"
-    )
-    #
     # Stop stream chat runtime button
     btn_stop.click(
         fn=stop_agent_running_stream,
@@ -404,8 +418,8 @@ with gr.Blocks(
     # Owner model dropdowns selection
     owner_dropdown.change(
         fn=lambda selected_owner: (
-            update_model_name_dropdown(selected_owner),  
-            get_full_model_name(selected_owner, owner_to_models[selected_owner][0])  
+            update_model_name_dropdown(selected_owner),
+            owner_default_models[selected_owner]
         ),
         inputs=owner_dropdown,
         outputs=[model_name_dropdown, full_model_name]
@@ -413,7 +427,10 @@ with gr.Blocks(
     #
     # Name model dropdowns selection
     model_name_dropdown.change(
-        fn=get_full_model_name,
+        fn=lambda owner, model_name: (
+            model_full_names.get(owner, {}).get(model_name)
+            or get_full_model_name(owner, model_name)
+        ),
         inputs=[owner_dropdown, model_name_dropdown],
         outputs=full_model_name
     )
@@ -481,14 +498,6 @@ with gr.Blocks(
         show_progress="hidden",
     )
     #
-    # Session radio selection
-    session_radio.change(
-        fn=load_sessions_history,
-        inputs=[session_radio, username, chat_event_metadata_radio, latex_mode_radio],
-        outputs=[chatbot, chatbot],
-        show_progress="hidden"
-    )
-    #
     # Delete selected session button
     delete_session_btn.click(
         fn=delete_session_from_db,
@@ -538,8 +547,14 @@ with gr.Blocks(
     # Upload knowledge button
     upload_knowledge_btn.click(
         fn=upload_file_to_base_knowledge, 
-        inputs=[knowledge_base_selector_radio, upload_file],
-        outputs=[upload_file]
+        inputs=[knowledge_base_selector_radio, upload_file, username],
+        outputs=[upload_file, upload_status_timer]
+    )
+    upload_status_timer.tick(
+        fn=check_upload_status,
+        inputs=[username],
+        outputs=[upload_status_timer],
+        show_progress="hidden",
     )
     
 
@@ -549,5 +564,7 @@ if __name__ == "__main__":
         favicon_path=bot_avatar,
         server_name="0.0.0.0",
         server_port=7860,
-        debug=True,
+        max_threads=settings.MAX_THREADS,
+        show_error=settings.DEBUG_MODE,
+        debug=settings.DEBUG_MODE,
     )
\ No newline at end of file
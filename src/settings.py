@@ -33,8 +33,15 @@ MODELS = (
 # Data base path
 DB_FILE = "tmp/agent.db"
 
-# Chat stream time control
-STREAM_DELAY = 0.01
+# Chat stream time control - optional pacing (seconds) per chunk, 0 disables it
+STREAM_DELAY = 0
+
+# Chat stream batching - chunks per UI update grow 1, 3, 9... up to STREAM_BATCH_SIZE
+STREAM_BATCH_SIZE = 27
+STREAM_BATCH_GROWTH = 3
+
+# Chat stream maximum time (seconds) between UI updates
+STREAM_FLUSH_INTERVAL = 0.03
 
 # Ollama internal Docker url - binded to host by extra_hosts
 OLLAMA_URL = "http://localhost:11434"
@@ -42,9 +49,12 @@ OLLAMA_URL = "http://localhost:11434"
 # Set numer of session runs for short-term memory
 SHORT_MEM_RUNS = 3
 
-# Set agent to verbose mode
+# Set agent and Gradio server to verbose mode
 DEBUG_MODE = True
 
+# Gradio worker threads for concurrent users
+MAX_THREADS = 64
+
 # Maximum tokens generated by the model
 MAX_TOKENS = 8000
 
@@ -2,10 +2,24 @@
 import settings
 
 from agno.agent import Agent
+from cachetools import LRUCache
 from utils.models import get_model
 from agno.db.sqlite import SqliteDb
 from utils.process_knowledge import load_base_knowledge_to_agent
 
+# Configure SqliteDb with specific tables
+agent_db = SqliteDb(
+    db_file=settings.DB_FILE,
+    session_table="agent_sessions",
+    memory_table="user_memories",
+)
+
+# Long-lived agents by user session - (model configuration, agent)
+_agents_cache = LRUCache(maxsize=64)
+
+# Agents running a turn (by id) - never reconfigured while busy
+_agents_busy = set()
+
 
 async def get_agent(
     knowledge_base_selector: str,
@@ -19,12 +33,20 @@ async def get_agent(
     long_term_memory_selector: str,
     short_memory_history_runs: int,
     chat_event_reasoning: str | None,
+    username: str,
+    session_id: str,
 ):
     """
-    Initialize and return a configured Agent instance.
+    Return the Agent of a user session configured for the current turn.
 
     This function loads the knowledge base, sets up short-term and long-term memory options,
-    initializes the selected model, and enables reasoning if applicable.
+    initializes the selected model, and enables reasoning if applicable. The Agent is created
+    once per user session and only its mutable settings are updated on the following turns;
+    the model is rebuilt only when the model or its sampling parameters change.
+
+    The returned Agent is marked busy until `release_agent` is called at the end of the turn.
+    If the session Agent is still busy with another turn (e.g. the same session open in two
+    tabs), a new Agent is built instead of reconfiguring the running one.
 
     Args:
         knowledge_base_selector (str): Enables ("ON") or disables ("OFF") knowledge base.
@@ -38,53 +60,74 @@ async def get_agent(
         long_term_memory_selector (str): Enables ("ON") or disables ("OFF") long-term memory.
         short_memory_history_runs (int): Number of past interactions stored in short-term memory.
         chat_event_reasoning (str | None): Enables reasoning mode if set to "Agent".
+        username (str): The user ID owning the session.
+        session_id (str): The chat session identifier.
 
     Returns:
         Agent: A fully configured Agent instance.
     """
 
     # Enable | Disable short memory
-    if short_term_memory_selector == "ON":
-        add_history_to_context = True
-    else:
-        add_history_to_context = False
+    add_history_to_context = short_term_memory_selector == "ON"
 
     # Enable | Disable long memory
-    if long_term_memory_selector == "ON":
-        enable_user_memories = True
-    else:
-        enable_user_memories = False
+    enable_user_memories = long_term_memory_selector == "ON"
 
     # Set agent reasoning
-    if chat_event_reasoning and chat_event_reasoning[0] == "Agent":
-        reasonig_var = True
-    else:
-        reasonig_var = False
+    reasonig_var = bool(chat_event_reasoning) and chat_event_reasoning[0] == "Agent"
 
     pdf_knowledge_base, search_knowledge = await load_base_knowledge_to_agent(
         knowledge_base_selector=knowledge_base_selector
     )
 
-    model = get_model(selected_model, temperature, top_p, top_k, max_tokens_number)
+    model_config = (selected_model, temperature, top_p, top_k, max_tokens_number)
 
-    # Configure SqliteDb with specific tables
-    db = SqliteDb(
-        db_file=settings.DB_FILE,
-        session_table="agent_sessions",  
-        memory_table="user_memories",  
-    )
+    # No awaits from here on - checking and marking the agent busy is atomic in the event loop
+    cached = _agents_cache.get((username, session_id))
+
+    if cached is None or id(cached[1]) in _agents_busy:
+        agent = _build_agent()
+        agent_model_config = None
+    else:
+        agent_model_config, agent = cached
 
-    agent = Agent(
-        model=model,
+    # Swap the model only when its configuration changed
+    if agent_model_config != model_config:
+        agent.model = get_model(selected_model, temperature, top_p, top_k, max_tokens_number)
+        if agent.memory_manager is not None:
+            agent.memory_manager.model = agent.model
+
+    # Knowledge
+    agent.knowledge = pdf_knowledge_base
+    agent.search_knowledge = search_knowledge
+    # Short Memory
+    agent.add_history_to_context = add_history_to_context
+    agent.num_history_runs = short_memory_history_runs
+    # Long Memory
+    agent.enable_user_memories = enable_user_memories
+    agent.add_memories_to_context = enable_user_memories
+    if not enable_user_memories:
+        # agno keeps the manager after a memory-enabled run and extracts memories whenever it is set
+        agent.memory_manager = None
+    # Reasoning
+    agent.reasoning = reasonig_var
+
+    _agents_busy.add(id(agent))
+    _agents_cache[(username, session_id)] = (model_config, agent)
+
+    return agent
+
+
+def release_agent(agent: Agent):
+    """Mark an Agent returned by `get_agent` as free once its turn has ended"""
+    _agents_busy.discard(id(agent))
+
+
+def _build_agent() -> Agent:
+    """Build a new Agent with the settings shared by every turn"""
+    return Agent(
         # Main Data Base
-        db=db,
-        knowledge=pdf_knowledge_base,
-        search_knowledge=search_knowledge,
-        # Short Memory
-        add_history_to_context=add_history_to_context,
-        num_history_runs=short_memory_history_runs,
-        # Long Memory
-        enable_user_memories=enable_user_memories,
+        db=agent_db,
         add_datetime_to_context=True,
         markdown=True,
         debug_mode=settings.DEBUG_MODE,
@@ -95,7 +138,4 @@ async def get_agent(
             """
         ],
         store_events=True,
-        reasoning=reasonig_var,
     )
-
-    return agent
@@ -2,47 +2,83 @@
 import settings
 import gradio as gr
 
+from typing import Tuple
+from functools import lru_cache
 from collections import defaultdict
 
-def get_owners_to_models() -> defaultdict:
+def split_owners_and_models() -> Tuple[Tuple[str, ...], Tuple[Tuple[str, ...], ...]]:
     """
-    Map model providers to their respective model identifiers.
+    Split the configured models into parallel tuples of providers and model identifiers.
 
     This function iterates over the list of models defined in `settings.MODELS`,
     extracts the provider (the part before the first underscore) and the model
-    identifier (the part after the first underscore, and groups the models by their providers.
+    identifier (the part after the first underscore), keeping the providers in
+    their first-seen order.
+
+    Returns:
+        Tuple: A tuple containing:
+            - The providers, in order of appearance.
+            - The model identifiers of each provider, aligned with the providers.
+    """
+    owners = []
+    models_per_owner = []
+    owner_index = {}
+    for model in settings.MODELS:
+        # Split the owner (before the first "_") and the model name (after the "_")
+        owner, _, model_name = model.partition("_")
+        if owner not in owner_index:
+            owner_index[owner] = len(owners)
+            owners.append(owner)
+            models_per_owner.append([])
+        models_per_owner[owner_index[owner]].append(model_name)
+    return tuple(owners), tuple(tuple(models) for models in models_per_owner)
+
+# Providers and their models - static after import
+OWNERS, OWNER_MODELS = split_owners_and_models()
+OWNER_INDEX = {owner: i for i, owner in enumerate(OWNERS)}
+
+def get_owners() -> Tuple[str, ...]:
+    """Return the model providers in order of appearance"""
+    return OWNERS
+
+def get_models_for(owner: str) -> Tuple[str, ...]:
+    """Return the model identifiers of a provider"""
+    return OWNER_MODELS[OWNER_INDEX[owner]]
+
+@lru_cache(maxsize=1)
+def get_owners_to_models() -> defaultdict:
+    """
+    Map model providers to their respective model identifiers.
+
+    This function groups the models defined in `settings.MODELS` by their providers,
+    built from the precomputed `OWNERS` and `OWNER_MODELS` tuples.
+    The result is cached since `settings.MODELS` is static.
 
     Returns:
         defaultdict[list]: A dictionary mapping each provider to a list of their model identifiers.
     """
     # Create dictionary to map owners to models
     owner_to_models = defaultdict(list)
-    for model in settings.MODELS:
-        # Extract the owner (before the first "_")
-        owner = model.split("_")[0]
-        # Extract the model name (after the "_")  
-        model_name = model[len(owner) + 1:]  
-        owner_to_models[owner].append(model_name)
+    for owner, models in zip(OWNERS, OWNER_MODELS):
+        owner_to_models[owner].extend(models)
     return owner_to_models
 
-def update_model_name_dropdown(selected_owner: str) -> gr.Dropdown:
+def update_model_name_dropdown(selected_owner: str) -> gr.update:
     """
     Update the model dropdown options based on the selected provider.
 
-    This function retrieves the mapping of providers to their models,
-    selects the models corresponding to the chosen provider, and
-    returns a Gradio Dropdown component with these options.
+    This function selects the models corresponding to the chosen provider
+    and returns a Gradio update with only the changed dropdown options.
 
     Args:
         selected_owner (str): The provider selected by the user.
 
     Returns:
-        gr.Dropdown: A Gradio Dropdown component populated with the models of the selected provider.
+        gr.update: A Gradio update object with the models of the selected provider.
     """
-    owner_to_models = get_owners_to_models()
-    models = owner_to_models[selected_owner]
-    
-    return gr.Dropdown(choices=models, value=models[0])  
+    models = get_models_for(selected_owner)
+
+    return gr.update(choices=list(models), value=models[0])
 
 def get_full_model_name(owner: str, model_name: str) -> str:
     """
@@ -58,4 +94,4 @@ def get_full_model_name(owner: str, model_name: str) -> str:
     Returns:
         str: The full model identifier in the format "owner_modelname".
     """
-    return f"{owner}_{model_name}"
\ No newline at end of file
+    return f"{owner}_{model_name}"
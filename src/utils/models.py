@@ -1,19 +1,103 @@
 # Open-LLM-webchat - Models
 import os
+import httpx
 import settings
 
 from dotenv import load_dotenv
-from agno.models.groq import Groq
-from agno.models.ollama import Ollama
-from agno.models.google import Gemini
-from agno.models.nvidia import Nvidia
-from agno.models.openai import OpenAIChat
-from agno.knowledge.embedder.google import GeminiEmbedder
 
 
 # Load .env
 load_dotenv()
 
+# Providers API keys
+_OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+_GOOGLE_KEY = os.getenv("GOOGLE_API_KEY")
+_GROQ_KEY = os.getenv("GROQ_API_KEY")
+_NVIDIA_KEY = os.getenv("NVIDIA_API_KEY")
+
+# Shared async HTTP client - keeps connections alive across turns for OpenAI-compatible providers
+# Same timeout as the OpenAI SDK default client - long non-streamed completions must not be cut
+_HTTP_CLIENT = httpx.AsyncClient(
+    timeout=httpx.Timeout(600.0, connect=5.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=32),
+)
+
+
+# Providers factories - SDKs are imported on first use of each provider
+def _openai_model(model: str, llm_temp: float, llm_top_p: float, llm_top_k: float, max_tokens: int) -> object:
+    """Build an OpenAI chat model"""
+    from agno.models.openai import OpenAIChat
+
+    return OpenAIChat(
+        id=model,
+        api_key=_OPENAI_KEY,
+        temperature=llm_temp,
+        top_p=llm_top_p,
+        max_retries=3,
+        max_completion_tokens=max_tokens,
+        http_client=_HTTP_CLIENT,
+    )
+
+
+def _google_model(model: str, llm_temp: float, llm_top_p: float, llm_top_k: float, max_tokens: int) -> object:
+    """Build a Google Gemini model"""
+    from agno.models.google import Gemini
+
+    return Gemini(
+        id=model,
+        api_key=_GOOGLE_KEY,
+        temperature=llm_temp,
+        top_p=llm_top_p,
+        top_k=llm_top_k,
+        max_output_tokens=max_tokens,
+    )
+
+
+def _groq_model(model: str, llm_temp: float, llm_top_p: float, llm_top_k: float, max_tokens: int) -> object:
+    """Build a Groq model"""
+    from agno.models.groq import Groq
+
+    return Groq(
+        id=model,
+        api_key=_GROQ_KEY,
+        temperature=llm_temp,
+        top_p=llm_top_p,
+        max_retries=3,
+        max_tokens=max_tokens,
+    )
+
+
+def _nvidia_model(model: str, llm_temp: float, llm_top_p: float, llm_top_k: float, max_tokens: int) -> object:
+    """Build a Nvidia model"""
+    from agno.models.nvidia import Nvidia
+
+    return Nvidia(
+        id=model,
+        api_key=_NVIDIA_KEY,
+        temperature=llm_temp,
+        top_p=llm_top_p,
+        max_retries=3,
+        max_completion_tokens=max_tokens,
+        http_client=_HTTP_CLIENT,
+    )
+
+
+def _ollama_model(model: str, llm_temp: float, llm_top_p: float, llm_top_k: float, max_tokens: int) -> object:
+    """Build a local Ollama model"""
+    from agno.models.ollama import Ollama
+
+    return Ollama(id=model, host=settings.OLLAMA_URL)
+
+
+# Model factories by provider prefix
+_MODEL_FACTORIES = {
+    "OpenAI": _openai_model,
+    "Google": _google_model,
+    "Groq": _groq_model,
+    "Nvidia": _nvidia_model,
+    "Ollama": _ollama_model,
+}
+
 
 def get_model(
     llm_type: str, llm_temp: float, llm_top_p: float, llm_top_k: float, max_tokens: int
@@ -21,8 +105,9 @@ def get_model(
     """
     Initialize and return a language model instance based on the selected provider.
 
-    This function detects the model provider (Google, Groq, Cerebras, or Ollama)
-    from the given `llm_type` and returns the corresponding configured model object.
+    This function detects the model provider (OpenAI, Google, Groq, Nvidia, or Ollama)
+    from the prefix of the given `llm_type` and dispatches to the corresponding
+    factory in `_MODEL_FACTORIES` to build the configured model object.
 
     Args:
         llm_type (str): Model type identifier.
@@ -32,61 +117,18 @@ def get_model(
         max_tokens (int): Maximum number of tokens generated (input + output).
 
     Returns:
-        object: A configured model instance for the selected LLM provider.
+        object: A configured model instance for the selected LLM provider,
+            or None if the provider is unknown.
     """
 
-    # OpenAI
-    if llm_type.startswith("OpenAI"):
-        model = llm_type.split("_", 1)[1]
-        return OpenAIChat(
-            id=model,
-            api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=llm_temp,
-            top_p=llm_top_p,
-            max_retries=3,
-            max_completion_tokens=max_tokens,
-        )
-
-    # Google
-    if llm_type.startswith("Google"):
-        model = llm_type.split("_", 1)[1]
-        return Gemini(
-            id=model,
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=llm_temp,
-            top_p=llm_top_p,
-            top_k=llm_top_k,
-            max_output_tokens=max_tokens,
-        )
-
-    # Groq
-    elif llm_type.startswith("Groq"):
-        model = llm_type.split("_", 1)[1]
-        return Groq(
-            id=model,
-            api_key=os.getenv("GROQ_API_KEY"),
-            temperature=llm_temp,
-            top_p=llm_top_p,
-            max_retries=3,
-            max_tokens=max_tokens,
-        )
-
-    # Nvidia
-    elif llm_type.startswith("Nvidia"):
-        model = llm_type.split("_", 1)[1]
-        return Nvidia(
-            id=model,
-            api_key=os.getenv("NVIDIA_API_KEY"),
-            temperature=llm_temp,
-            top_p=llm_top_p,
-            max_retries=3,
-            max_completion_tokens=max_tokens,
-        )
-
-    # Ollama
-    elif llm_type.startswith("Ollama"):
-        model = llm_type.split("_", 1)[1]
-        return Ollama(id=model, host=settings.OLLAMA_URL)
+    # Split provider prefix and model id
+    prefix, _, model = llm_type.partition("_")
+
+    factory = _MODEL_FACTORIES.get(prefix)
+    if factory is None:
+        return None
+
+    return factory(model, llm_temp, llm_top_p, llm_top_k, max_tokens)
 
 
 def get_embedding_model() -> object:
@@ -94,16 +136,18 @@ def get_embedding_model() -> object:
     Initialize and return the embedding model instance.
 
     This function creates a Gemini embedding model with predefined ID and dimensions,
-    using the API key from the environment variables.
+    using the Google API key loaded from the environment at import.
 
     Returns:
         GeminiEmbedder: Configured embedding model instance.
     """
 
+    from agno.knowledge.embedder.google import GeminiEmbedder
+
     embedding_model = GeminiEmbedder(
         id="gemini-embedding-001",
         dimensions=768,
-        api_key=os.getenv("GOOGLE_API_KEY"),
+        api_key=_GOOGLE_KEY,
     )
 
     return embedding_model
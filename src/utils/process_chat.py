@@ -1,4 +1,5 @@
 # Open-LLM-webchat - Process runtime chat messages
+import time
 import asyncio
 import settings
 import traceback
@@ -8,19 +9,27 @@ from colorama import Fore
 from gradio import ChatMessage
 from typing import List, Tuple
 from agno.agent import RunEvent
-from utils.agent import get_agent
+from contextlib import AsyncExitStack
+from utils.agent import get_agent, release_agent
 from agno.tools.mcp import MultiMCPTools
 from agno.tools.reasoning import ReasoningTools
-from utils.process_session import get_session_ids_from_db
-from typing import AsyncGenerator, Tuple, List, Dict, Any
+from utils.process_session import get_session_ids_from_db, fetch_session_runs
+from typing import AsyncGenerator, AsyncIterator, Tuple, List, Dict, Any
 from utils.process_mcp import load_mcps_stdioserverparameters
 
 # Globals variables
 running_agent = None
 current_run_id = None
 
-# Load MCPs server parameters 
-stdio_server_params = load_mcps_stdioserverparameters()
+# End of stream marker for _stream_with_ticks
+_STREAM_END = object()
+
+# Reusable UI updates - without "value", which Gradio consumes from the update dict
+_TEXTBOX_STREAMING = gr.update(placeholder="...", interactive=False)
+_STOP_BTN_SHOW = gr.update(visible=True)
+_STOP_BTN_HIDE = gr.update(visible=False)
+_CHATBOT_SIZE = gr.update(min_height=650, max_height=650)
+
 
 async def get_response(
     user_msg: str,
@@ -93,13 +102,16 @@ async def get_response(
     chat_history.append(ChatMessage(role="user", content=user_msg)) 
     chat_history.append(ChatMessage(role="assistant", content="### ..."))
     
+    # Session list - refreshed only when the turn ends
+    session_ids = await asyncio.to_thread(get_session_ids_from_db, username)
+    
     # First yield to show user message and empty response from assistant
     yield (
         gr.update(placeholder="...", value="", interactive=False),
         chat_history,
-        get_session_ids_from_db(username),
-        gr.update(visible=False),
-        gr.update(min_height=650, max_height=650),
+        session_ids,
+        _STOP_BTN_HIDE,
+        _CHATBOT_SIZE,
     )
 
     # Use the selected session ID if available, otherwise use the unique session ID
@@ -118,118 +130,178 @@ async def get_response(
         short_term_memory_selector=short_term_memory_selector,
         long_term_memory_selector=long_term_memory_selector,
         short_memory_history_runs=short_memory_history_runs,
-        chat_event_reasoning=chat_event_reasoning
+        chat_event_reasoning=chat_event_reasoning,
+        username=username,
+        session_id=selected_session,
     )
     
     # Set global variable
     running_agent = agent
     
-    # Set tools
-    agent.tools = []
+    # Set tools for this turn
+    tools = []
     
-    # Set Reasoning tool
+    # Set Reasoning tool - one per turn, agno binds its functions to the running session
     if chat_event_reasoning and chat_event_reasoning[0] == "Tool" and mcp_tools_radio == "ON":
-        agent.tools.append(ReasoningTools(add_instructions=True))
+        tools.append(ReasoningTools(add_instructions=True))
 
     try:
-        stream_response = ""
+        stream_parts = []
         
-        # Asynchronous integration of mcps in chat
-        async with MultiMCPTools(server_params_list=stdio_server_params, timeout_seconds=20) as mcp_tools:
+        # Asynchronous integration of mcps in chat - servers only start when enabled
+        async with AsyncExitStack() as stack:
             
             if mcp_tools_radio == "ON":
-                agent.tools.append(mcp_tools)
+                # Server parameters follow edits of the MCPs config (read cached by file mtime)
+                mcp_tools = await stack.enter_async_context(
+                    MultiMCPTools(server_params_list=load_mcps_stdioserverparameters(), timeout_seconds=20)
+                )
+                tools.append(mcp_tools)
+            
+            # Assign tools at once (set_tools flags the cached agent to rebuild its tools)
+            agent.set_tools(tools)
             
             # Stream chat
             if chat_stream_radio == "ON":
                 
-                # Load stream chunks responses for agent
-                async for chunk in agent.arun(
-                    user_msg,
-                    user_id=username,
-                    session_id=selected_session,
-                    stream=True,
-                    stream_intermediate_steps=True,
-                ):
-                    current_run_id = chunk.run_id
-                    
-                    await asyncio.sleep(settings.STREAM_DELAY)
-
-                    # Tool start event 
-                    if chunk.event == RunEvent.tool_call_started:
-                        stream_response += "\n"
+                # Assistant message updated in place - starts as the "### ..." placeholder
+                assistant_msg = chat_history[-1]
+                placeholder_live = True
+                
+                # Batch content chunks between UI updates
+                batch_size = 1
+                pending_chunks = 0
+                last_flush = time.monotonic()
+                
+                try:
+                    # Load stream chunks responses for agent - None marks a pause in the stream
+                    async for chunk in _stream_with_ticks(
+                        agent.arun(
+                            user_msg,
+                            user_id=username,
+                            session_id=selected_session,
+                            stream=True,
+                            stream_intermediate_steps=True,
+                        ),
+                        settings.STREAM_FLUSH_INTERVAL,
+                    ):
+                        flush_now = False
                         
-                        if chat_event_metadata_radio == "ON":
+                        # Pause event - show pending content while waiting
+                        if chunk is None:
+                            flush_now = pending_chunks > 0
+                        
+                        else:
+                            current_run_id = chunk.run_id
                             
-                            if chat_history[-1].content == "### ...":
-                                chat_history[-1] = ChatMessage(role="assistant", content="")
+                            if settings.STREAM_DELAY:
+                                await asyncio.sleep(settings.STREAM_DELAY)
+
+                            # Tool start event 
+                            if chunk.event == RunEvent.tool_call_started:
                                 
-                            stream_response += "\n"
-                            
-                            custom_content = (
-                                f"\n**Tool:** `{chunk.tool.tool_name}`\n"
-                                f"**Arguments:** `{chunk.tool.tool_args}`\n"
-                            )
-                            
-                            chat_history.append(ChatMessage(
-                                role="assistant",
-                                content=custom_content,
-                                metadata={"title": "🛠️ ToolCallStarted"}
-                            ))
-                            
-                            yield (
-                                gr.update(placeholder="...", value="", interactive=False),
-                                chat_history,
-                                get_session_ids_from_db(username),
-                                gr.update(visible=True),
-                                gr.update(min_height=650, max_height=650),
-                            )
-                    
-                    # Tool completed event 
-                    elif chunk.event == RunEvent.tool_call_completed:
-                        if chat_event_metadata_radio == "ON":
+                                # Flush pending content before tool messages
+                                flushed = pending_chunks > 0
+                                if flushed:
+                                    assistant_msg.content = "".join(stream_parts)
+                                    pending_chunks = 0
+                                    placeholder_live = False
+                                    
+                                stream_parts.append("\n")
+                                
+                                if chat_event_metadata_radio == "ON":
+                                    
+                                    if placeholder_live:
+                                        assistant_msg.content = ""
+                                        placeholder_live = False
+                                        
+                                    stream_parts.append("\n")
+                                    
+                                    custom_content = (
+                                        f"\n**Tool:** `{chunk.tool.tool_name}`\n"
+                                        f"**Arguments:** `{chunk.tool.tool_args}`\n"
+                                    )
+                                    
+                                    chat_history.append(ChatMessage(
+                                        role="assistant",
+                                        content=custom_content,
+                                        metadata={"title": "🛠️ ToolCallStarted"}
+                                    ))
+                                
+                                if chat_event_metadata_radio == "ON" or flushed:
+                                    yield (
+                                        _TEXTBOX_STREAMING,
+                                        chat_history,
+                                        session_ids,
+                                        _STOP_BTN_SHOW,
+                                        _CHATBOT_SIZE,
+                                    )
                             
-                            if chat_history[-1].content == "### ...":
-                                chat_history[-1] = ChatMessage(role="assistant", content="")
+                            # Tool completed event 
+                            elif chunk.event == RunEvent.tool_call_completed:
+                                if chat_event_metadata_radio == "ON":
+                                    
+                                    if placeholder_live:
+                                        assistant_msg.content = ""
+                                        placeholder_live = False
 
-                            custom_content = (
-                                f"\n**Results:** \n{chunk.tool.result}\n"
-                                f"**Execution time:** {chunk.tool.metrics.duration:.4f}s" if chunk.tool.metrics else "**Execution time:** N/A\n"
-                            )
-                            
-                            chat_history.append(ChatMessage(
-                                role="assistant",
-                                content=custom_content,
-                                metadata={"title": "🛠️ ToolCallCompleted"}
-                            ))
-                            
-                            chat_history.append(ChatMessage(role="assistant", content=""))
+                                    duration = f"{chunk.tool.metrics.duration:.4f}s" if chunk.tool.metrics else "N/A"
+                                    custom_content = (
+                                        f"\n**Results:** \n{chunk.tool.result}\n"
+                                        f"**Execution time:** {duration}"
+                                    )
+                                    
+                                    chat_history.append(ChatMessage(
+                                        role="assistant",
+                                        content=custom_content,
+                                        metadata={"title": "🛠️ ToolCallCompleted"}
+                                    ))
+                                    
+                                    assistant_msg = ChatMessage(role="assistant", content="")
+                                    chat_history.append(assistant_msg)
+                                    
+                                    stream_parts = []
+                                    
+                                    yield (
+                                        _TEXTBOX_STREAMING,
+                                        chat_history,
+                                        session_ids,
+                                        _STOP_BTN_SHOW,
+                                        _CHATBOT_SIZE,
+                                    )
                             
-                            stream_response = ""
+                            # Assistant menssages event
+                            elif chunk.event == RunEvent.run_content and isinstance(chunk.content, str):
+                                stream_parts.append(chunk.content)
+                                pending_chunks += 1
+                                flush_now = (
+                                    pending_chunks >= batch_size
+                                    or time.monotonic() - last_flush > settings.STREAM_FLUSH_INTERVAL
+                                )
+                        
+                        # Show pending content
+                        if flush_now:
+                            stream_response = "".join(stream_parts)
+                            stream_parts = [stream_response]
+                            assistant_msg.content = stream_response
+                            placeholder_live = False
                             
                             yield (
-                                gr.update(placeholder="...", value="", interactive=False),
+                                _TEXTBOX_STREAMING,
                                 chat_history,
-                                get_session_ids_from_db(username),
-                                gr.update(visible=True),
-                                gr.update(min_height=650, max_height=650),
+                                session_ids,
+                                _STOP_BTN_SHOW,
+                                _CHATBOT_SIZE,
                             )
-                    
-                    # Assistant menssages event
-                    if chunk.event == RunEvent.run_content:
-                        if isinstance(chunk.content, str):
-                            
-                            stream_response += chunk.content
                             
-                            chat_history[-1] = ChatMessage(role="assistant", content=stream_response)
-                            
-                            yield (
-                                gr.update(placeholder="...", value="", interactive=False),
-                                chat_history,
-                                get_session_ids_from_db(username),
-                                gr.update(visible=True),
-                                gr.update(min_height=650, max_height=650),
-                            )
+                            pending_chunks = 0
+                            last_flush = time.monotonic()
+                            batch_size = min(batch_size * settings.STREAM_BATCH_GROWTH, settings.STREAM_BATCH_SIZE)
+                
+                finally:
+                    # Flush remaining content - also kept when the stream fails
+                    if pending_chunks:
+                        assistant_msg.content = "".join(stream_parts)
             
             # Not Stream chat
             elif chat_stream_radio == "OFF":
@@ -242,80 +314,66 @@ async def get_response(
                     stream=False,
                 )
 
-                if chat_history[-1].content == "### ...":
-                    chat_history[-1] = ChatMessage(role="assistant", content="")
-
-                # Process assistant messages and tools events
-                if chat_event_metadata_radio == "ON":
-                    
-                    # Find the index of the last message with role='user'
-                    last_user_index = max(
-                        (i for i, message in enumerate(agent_response.messages) if message.role == "user"),
-                        default=-1
-                    )
-
-                    # Iterate only through messages after the last 'user'
-                    for message in agent_response.messages[last_user_index + 1:]:
-
-                        if message.role == "tool":
-                            tool_name = message.tool_name
-                            tool_args = message.tool_args
-                            exec_time = "N/A"
-
-                            custom_content_started = (
-                                f"\n**Tool:** `{tool_name}`\n"
-                                f"**Arguments:** `{tool_args}`\n"
-                            )
-                            
-                            chat_history.append(ChatMessage(
-                                role="assistant",
-                                content=custom_content_started,
-                                metadata={"title": "🛠️ ToolCallStarted"}
-                            ))
-
-                            result_text = message.content.strip() if message.content else ""
-                            custom_content_completed = (
-                                f"**Results:**\n{result_text}\n"
-                                f"**Execution time:** {exec_time}"
-                            )
-                            
-                            chat_history.append(ChatMessage(
-                                role="assistant",
-                                content=custom_content_completed,
-                                metadata={"title": "🛠️ ToolCallCompleted"}
-                            ))
-
-                        elif message.role == "assistant":
-                            chat_history.append(ChatMessage(
-                                role="assistant",
-                                content="" if message.content is None else message.content
-                            ))
+                # Replace the placeholder - nothing has been rendered yet
+                chat_history[-1] = ChatMessage(role="assistant", content="")
+
+                # Find the index of the last message with role='user'
+                last_user_index = next(
+                    (
+                        i for i in range(len(agent_response.messages) - 1, -1, -1)
+                        if agent_response.messages[i].role == "user"
+                    ),
+                    -1
+                )
                 
-                # Process messages from assistant only 
-                else:
-                    
-                    # Find the index of the last message with role='user'
-                    last_user_index = max(
-                        (i for i, message in enumerate(agent_response.messages) if message.role == "user"),
-                        default=-1
-                    )
-
-                    # Iterate only through messages after the last 'user'
-                    for message in agent_response.messages[last_user_index + 1:]:
-
-                        if message.role == "assistant":
-                            chat_history.append(ChatMessage(
-                                role="assistant",
-                                content="" if message.content is None else message.content
-                            ))
+                show_metadata = chat_event_metadata_radio == "ON"
+
+                # Iterate only through messages after the last 'user'
+                for message in agent_response.messages[last_user_index + 1:]:
+
+                    # Tools events - only when metadata is enabled
+                    if message.role == "tool" and show_metadata:
+                        tool_name = message.tool_name
+                        tool_args = message.tool_args
+                        exec_time = "N/A"
+
+                        custom_content_started = (
+                            f"\n**Tool:** `{tool_name}`\n"
+                            f"**Arguments:** `{tool_args}`\n"
+                        )
+                        
+                        chat_history.append(ChatMessage(
+                            role="assistant",
+                            content=custom_content_started,
+                            metadata={"title": "🛠️ ToolCallStarted"}
+                        ))
+
+                        result_text = message.content.strip() if message.content else ""
+                        custom_content_completed = (
+                            f"**Results:**\n{result_text}\n"
+                            f"**Execution time:** {exec_time}"
+                        )
+                        
+                        chat_history.append(ChatMessage(
+                            role="assistant",
+                            content=custom_content_completed,
+                            metadata={"title": "🛠️ ToolCallCompleted"}
+                        ))
+
+                    # Assistant messages
+                    elif message.role == "assistant":
+                        chat_history.append(ChatMessage(
+                            role="assistant",
+                            content="" if message.content is None else message.content
+                        ))
                                               
             # Update sessions after completion
             yield (
                 gr.update(placeholder="Ask something...", value="", interactive=True),
                 chat_history,
-                get_session_ids_from_db(username),
-                gr.update(visible=False),
-                gr.update(min_height=650, max_height=650),
+                await asyncio.to_thread(get_session_ids_from_db, username),
+                _STOP_BTN_HIDE,
+                _CHATBOT_SIZE,
             )
             
     except Exception as e:
@@ -325,20 +383,71 @@ async def get_response(
         print(f"{Fore.LIGHTRED_EX}{menssagem}{nome_da_excecao}:{track_line}{Fore.RESET}")
         #
         error_msg = "An error occurred while processing your request."
-        chat_history[-1] = ChatMessage(role="assistant", content=error_msg)
+        
+        # Keep the partial answer already shown - replace only the placeholder or an empty message
+        if chat_history[-1].content and chat_history[-1].content != "### ...":
+            chat_history.append(ChatMessage(role="assistant", content=error_msg))
+        else:
+            chat_history[-1] = ChatMessage(role="assistant", content=error_msg)
         yield (
             gr.update(placeholder="Ask something...", value="", interactive=True),
             chat_history,
-            get_session_ids_from_db(username),
-            gr.update(visible=False),
-            gr.update(min_height=650, max_height=650),
+            await asyncio.to_thread(get_session_ids_from_db, username),
+            _STOP_BTN_HIDE,
+            _CHATBOT_SIZE,
         )
         #traceback.print_exc()  
         
     finally:
         running_agent = None
+        release_agent(agent)
+        
+        # The session was saved by the run - drop runs cached before it
+        fetch_session_runs.cache_clear()
         
 
+async def _stream_with_ticks(stream: AsyncIterator[Any], interval: float) -> AsyncIterator[Any]:
+    """
+    Yield the items of an async stream, and None whenever `interval` seconds pass without one.
+
+    The stream is consumed by a background task, so pauses in the model output (tool calls,
+    slow tokens) can be used to show buffered content. Errors of the stream are re-raised.
+
+    Args:
+        stream (AsyncIterator[Any]): The async stream to consume.
+        interval (float): Seconds without items before a None tick is yielded.
+
+    Yields:
+        Any: The stream items in order, or None on each pause tick.
+    """
+    queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for item in stream:
+                queue.put_nowait(item)
+        finally:
+            queue.put_nowait(_STREAM_END)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+
+            if item is _STREAM_END:
+                # Re-raise the stream error, if any
+                await producer
+                return
+
+            yield item
+    finally:
+        producer.cancel()
+
+
 def stop_agent_running_stream():
     """Stop the current run streaming generation"""
     global running_agent
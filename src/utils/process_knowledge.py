@@ -1,10 +1,15 @@
 # Open-LLM-webchat - Process the knowledge base (RAG - PDF)
+import asyncio
+import hashlib
 import gradio as gr
 
+from colorama import Fore
 from agno.db.sqlite import SqliteDb
 from agno.vectordb.chroma import ChromaDb
 from utils.models import get_embedding_model
+from agno.utils.string import generate_id
 from agno.knowledge.knowledge import Knowledge
+from agno.knowledge.content import ContentStatus
 from agno.knowledge.reader.pdf_reader import PDFReader
 from agno.knowledge.chunking.recursive import RecursiveChunking
 
@@ -28,40 +33,135 @@ pdf_reader = PDFReader(
     chunking_strategy=RecursiveChunking(chunk_size=1000, overlap=100),
 )
 
-async def upload_file_to_base_knowledge(knowledge_base_selector: str, knowledge_base_path: str):
+# Persistent knowledge base shared by uploads and agents
+knowledge_base = Knowledge(vector_db=vector_db, contents_db=contents_db)
+
+# Serialize uploads to the shared knowledge base
+upload_lock = asyncio.Lock()
+
+# Background ingestion tasks by user
+upload_tasks = {}
+
+# Finished ingestions waiting to be shown to the user - (success, message)
+upload_results = {}
+
+
+async def upload_file_to_base_knowledge(
+    knowledge_base_selector: str, knowledge_base_path: str, username: str
+):
     """
-    Asynchronously upload a file to the knowledge base if enabled.
+    Start the upload of a file to the knowledge base in background if enabled.
 
     If the knowledge base selector is set to "ON" and a valid file path is provided,
-    this function adds the file content to the knowledge base using the configured
-    PDF reader and databases.
+    this function schedules the file ingestion (PDF reading, chunking and embedding)
+    as a background task and returns immediately, so the UI is not blocked while
+    large files are indexed. Only one ingestion runs at a time per user, and the
+    upload status timer is started to report its result (see `check_upload_status`).
 
     Args:
         knowledge_base_selector (str): Enables ("ON") or disables ("OFF") the knowledge base upload.
         knowledge_base_path (str): Path to the file to be added and processed in knowledge base.
+        username (str): The user uploading the file.
 
     Returns:
-        None: This function does not return a value.
+        Tuple: A tuple containing:
+            - None to clear the upload file component.
+            - Gradio update object for the upload status timer.
     """
     if knowledge_base_path and knowledge_base_selector == "ON":
-        knowledge = Knowledge(vector_db=vector_db, contents_db=contents_db)
-
-        await knowledge.add_content_async(
+        task = upload_tasks.get(username)
+        if task is not None and not task.done():
+            gr.Warning("A file is still being indexed, please wait before uploading another.", duration=3)
+            return None, gr.update()
+
+        task = asyncio.create_task(add_file_to_base_knowledge(knowledge_base_path))
+        task.add_done_callback(lambda t: report_upload(t, username, knowledge_base_path))
+        upload_tasks[username] = task
+        upload_results.pop(username, None)
+        gr.Info("Indexing started in background.", duration=3)
+        return None, gr.Timer(active=True)
+
+    gr.Info("File not uploaded, please enable knowledge base and upload the file..", duration=3)
+    return None, gr.update()
+
+
+async def add_file_to_base_knowledge(knowledge_base_path: str):
+    """Add a file to the shared knowledge base, one upload at a time"""
+    async with upload_lock:
+        await knowledge_base.add_content_async(
             path=knowledge_base_path,
             reader=pdf_reader,
             skip_if_exists=True,
         )
-        return gr.Success("File uploaded to knowledge base successfully.", duration=3)
 
-    return gr.Info("File not uploaded, please enable knowledge base and upload the file..", duration=3)
+        # agno logs indexing errors instead of raising them - check the stored result
+        # (content hash and id built as agno does for a path)
+        content_hash = hashlib.sha256(str(knowledge_base_path).encode()).hexdigest()
+        content_id = generate_id(content_hash)
+        status, status_message = knowledge_base.get_content_status(content_id)
+        if status == ContentStatus.FAILED:
+            error = status_message or "Indexing failed"
+        elif not await asyncio.to_thread(vector_db.content_hash_exists, content_hash):
+            error = "No text could be read from the file"
+        else:
+            return
+
+        # Forget the failed content so the same file can be uploaded again
+        await asyncio.to_thread(knowledge_base.remove_content_by_id, content_id)
+        raise RuntimeError(error)
+
+
+def report_upload(task: asyncio.Task, username: str, knowledge_base_path: str):
+    """Record the result of a background upload for the user and release the user slot"""
+    if upload_tasks.get(username) is not task:
+        return
+    del upload_tasks[username]
+
+    if task.cancelled():
+        print(f"{Fore.LIGHTYELLOW_EX}Upload cancelled: {knowledge_base_path}{Fore.RESET}")
+        upload_results[username] = (False, "File indexing was cancelled.")
+    elif task.exception() is not None:
+        print(f"{Fore.RED}Error uploading {knowledge_base_path}: {task.exception()}{Fore.RESET}")
+        upload_results[username] = (False, f"File indexing failed: {task.exception()}")
+    else:
+        print(f"{Fore.LIGHTGREEN_EX}File uploaded to knowledge base: {knowledge_base_path}{Fore.RESET}")
+        upload_results[username] = (True, "File uploaded to knowledge base successfully.")
+
+
+async def check_upload_status(username: str) -> gr.Timer:
+    """
+    Report the result of the user background upload once it has finished.
+
+    This function is polled by the upload status timer while a file is being indexed.
+    When the ingestion ends it shows a success or failure toast and stops the timer.
+
+    Args:
+        username (str): The user who uploaded the file.
+
+    Returns:
+        gr.Timer: A Gradio update that keeps the timer running or stops it.
+    """
+    task = upload_tasks.get(username)
+    if task is not None and not task.done():
+        return gr.update()
+
+    result = upload_results.pop(username, None)
+    if result is not None:
+        success, message = result
+        if success:
+            gr.Success(message, duration=3)
+        else:
+            gr.Warning(message, duration=5)
+
+    return gr.Timer(active=False)
 
 
 async def load_base_knowledge_to_agent(knowledge_base_selector: str):
     """
     Load the knowledge base for the agent if enabled.
 
-    If the knowledge base selector is set to "ON", this function initializes
-    the knowledge base using the configured databases and enables knowledge search.
+    If the knowledge base selector is set to "ON", this function returns the
+    persistent knowledge base and enables knowledge search.
 
     Args:
         knowledge_base_selector (str): Enables ("ON") or disables ("OFF") loading of the knowledge base.
@@ -72,7 +172,7 @@ async def load_base_knowledge_to_agent(knowledge_base_selector: str):
             - search_knowledge (bool): True if knowledge search is enabled, otherwise False.
     """
     if knowledge_base_selector == "ON":
-        knowledge = Knowledge(vector_db=vector_db, contents_db=contents_db)
+        knowledge = knowledge_base
         search_knowledge = True
 
     else:
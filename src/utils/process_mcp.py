@@ -3,30 +3,37 @@ import os
 import json
 
 from typing import List
+from functools import lru_cache
 from mcp import StdioServerParameters  
 
 json_path = "./mcps_config.json"
 
+@lru_cache(maxsize=4)
+def read_mcps_config(path: str, mtime: float) -> dict:
+    """Read the MCP servers JSON config, cached by file modification time"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 def load_mcps_stdioserverparameters() -> List[StdioServerParameters]:
     """
     Load MCP server configurations from a JSON file and return a list of server parameters.
 
     This function reads a JSON configuration file, merges each server's custom environment
     with the system environment, and creates a list of `StdioServerParameters` objects
-    representing the configured MCP servers.
+    representing the configured MCP servers. The system environment is copied once and
+    shared by servers without custom environment.
 
     Returns:
         List[StdioServerParameters]: A list of configured MCP server stdio parameters.
     """
-    with open(json_path, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = read_mcps_config(json_path, os.path.getmtime(json_path))
+
+    base_env = os.environ.copy()
 
     servers = []
     for name, data in config.items():
         # Merge system environment with custom environment if provided
-        env = os.environ.copy()
-        if "env" in data:
-            env.update(data["env"])
+        env = {**base_env, **data["env"]} if "env" in data else base_env
 
         # Create the server parameters
         params = StdioServerParameters(
@@ -1,19 +1,19 @@
 # Open-LLM-webchat - Clear long-term memory by user
 import os
+import asyncio
 import sqlite3
 import settings
 import gradio as gr
 
 from colorama import Fore
+from utils.process_session import db_lock, get_db_connection
 
-def clear_long_term_memory(username: str) -> gr.update:
+async def clear_long_term_memory(username: str) -> gr.update:
     """
     Clear the long-term memory of a specific user from the database.
 
-    This function connects to the SQLite database defined in settings, checks
-    if the `user_memories` table exists, verifies if the specified user has
-    records, and deletes all long-term memory entries associated with that user.
-    It prints informative messages for each step and handles database errors.
+    This function runs the blocking SQLite work in a worker thread so the
+    event loop stays free for other chat sessions while the memory is cleared.
 
     Args:
         username (str): The name of the user whose long-term memory will be cleared.
@@ -21,7 +21,26 @@ def clear_long_term_memory(username: str) -> gr.update:
     Returns:
         gr.update: A Gradio UI update object to hide the modal memory manegement.
     """
-    
+    return await asyncio.to_thread(clear_long_term_memory_from_db, username)
+
+
+def clear_long_term_memory_from_db(username: str) -> gr.update:
+    """
+    Delete the long-term memory records of a specific user from the database.
+
+    This function uses the shared SQLite connection and deletes all long-term
+    memory entries associated with that user in a single query. The number of
+    deleted rows tells whether the user had records, and a missing `user_memories`
+    table is reported from the database error. It prints informative messages
+    for each step and handles database errors.
+
+    Args:
+        username (str): The name of the user whose long-term memory will be cleared.
+
+    Returns:
+        gr.update: A Gradio UI update object to hide the modal memory manegement.
+    """
+
     db_path = settings.DB_FILE
 
     # Check if the file exists
@@ -31,39 +50,32 @@ def clear_long_term_memory(username: str) -> gr.update:
         return gr.update(visible=False)
 
     try:
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-
-        # Checks if the user_memories table exists
-        cur.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='user_memories';
-        """)
-        if cur.fetchone() is None:
-            print(f"{Fore.LIGHTYELLOW_EX}Table 'user_memories' does not exist.{Fore.RESET}")
-            conn.close()
-            gr.Warning("Table 'user_memories' does not exist.", duration=3)
-            return gr.update(visible=False)
+        # Delete the records - autocommit
+        with db_lock:
+            deleted = get_db_connection().execute(
+                "DELETE FROM user_memories WHERE user_id = ?", (username,)
+            ).rowcount
 
         # Checks if user exists in table
-        cur.execute("SELECT COUNT(*) FROM user_memories WHERE user_id = ?", (username,))
-        count = cur.fetchone()[0]
-
-        if count == 0:
+        if deleted == 0:
             print(f"{Fore.LIGHTYELLOW_EX}No records found for user '{username}'.{Fore.RESET}")
-            conn.close()
             gr.Warning(f"No records found for user '{username}'", duration=3)
             return gr.update(visible=False)
-
-        # Delete the records
-        cur.execute("DELETE FROM user_memories WHERE user_id = ?", (username,))
-        conn.commit()
-        conn.close()
         
         gr.Success(f"Long-term memory erased for the user '{username}'.", duration=3)
 
         print(f"{Fore.LIGHTGREEN_EX}Long-term memory erased for the user '{username}'.{Fore.RESET}")
 
+    except sqlite3.OperationalError as e:
+        # Checks if the user_memories table exists
+        if "no such table" not in str(e):
+            print(f"{Fore.RED}Error clearing memory: {e}{Fore.RESET}")
+            gr.Error("Error clearing memory.", duration=2)
+            return gr.update(visible=False)
+        
+        print(f"{Fore.LIGHTYELLOW_EX}Table 'user_memories' does not exist.{Fore.RESET}")
+        gr.Warning("Table 'user_memories' does not exist.", duration=3)
+
     except sqlite3.Error as e:
         print(f"{Fore.RED}Error clearing memory: {e}{Fore.RESET}")
         gr.Error("Error clearing memory.", duration=2)
@@ -1,14 +1,18 @@
 # Open-LLM-webchat - Process user sessions from data base
 import os
-import uuid
 import json
+import uuid
+import atexit
+import orjson
 import sqlite3
 import settings
+import threading
 
 import gradio as gr
 from typing import Tuple
 from colorama import Fore
 from datetime import datetime
+from functools import lru_cache
 from gradio import ChatMessage
 
 
@@ -32,13 +36,101 @@ def ensure_tmp_directory(db_file: str):
             print(f"{Fore.RED}Failed to create directory {db_dir}: {e}{Fore.RESET}")
 
 
+# Session queries - static, compiled once by the connection statement cache
+_SQL_TABLE_CHECK = "SELECT name FROM sqlite_master WHERE type='table' AND name='agent_sessions'"
+_SQL_LIST_SESSIONS = "SELECT session_id FROM agent_sessions WHERE user_id = ? ORDER BY rowid DESC"
+_SQL_SESSION_VERSION = "SELECT updated_at FROM agent_sessions WHERE session_id = ? AND user_id = ?"
+_SQL_LOAD_RUN = "SELECT runs FROM agent_sessions WHERE session_id = ? AND user_id = ?"
+_SQL_DELETE_ONE = "DELETE FROM agent_sessions WHERE session_id = ? AND user_id = ?"
+_SQL_DELETE_ALL = "DELETE FROM agent_sessions WHERE user_id = ?"
+_SQL_CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_agent_sessions_user_session ON agent_sessions(user_id, session_id)"
+)
+
+# Tool events metadata - shared by every rendered tool message
+_META_STARTED = {"title": "🛠️ ToolCallStarted"}
+_META_COMPLETED = {"title": "🛠️ ToolCallCompleted"}
+
+def _norm_list(content: list) -> str:
+    """Join the items of a list tool result into text"""
+    return "\n".join(str(item).strip() for item in content if item)
+
+
+def _norm_str(content: str) -> str:
+    """Return a text tool result unchanged"""
+    return content
+
+
+# Tool result normalization by type - any other type falls back to str()
+_NORMALIZE = {list: _norm_list, str: _norm_str}
+
+# Shared connection to the main data base - opened on first use
+_db_conn = None
+db_lock = threading.RLock()
+
+# Set once the agent_sessions table is found and indexed
+_table_checked = False
+_indexes_ready = False
+
+
+def get_db_connection() -> sqlite3.Connection:
+    """
+    Return the shared connection to the main SQLite database.
+
+    The connection is opened once in autocommit mode with WAL journaling, so
+    readers are not blocked by a concurrent write, and is closed at exit. It may
+    be used from any worker thread, and callers must hold `db_lock` while using it.
+
+    Returns:
+        sqlite3.Connection: The shared connection to `settings.DB_FILE`.
+    """
+    global _db_conn
+    if _db_conn is None:
+        db_file = settings.DB_FILE
+        ensure_tmp_directory(db_file)
+        conn = sqlite3.connect(
+            db_file, check_same_thread=False, isolation_level=None, cached_statements=256
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        atexit.register(conn.close)
+        _db_conn = conn
+    return _db_conn
+
+
+def _ensure_indexes(cursor: sqlite3.Cursor):
+    """Index agent_sessions by user once per process - the table must exist"""
+    global _indexes_ready
+    if not _indexes_ready:
+        # Optional speed-up - a failure (e.g. database locked) must not hide the sessions list
+        try:
+            cursor.execute(_SQL_CREATE_INDEX)
+            _indexes_ready = True
+        except sqlite3.Error as e:
+            print(f"{Fore.YELLOW}Warning: Could not create session index: {e}{Fore.RESET}")
+
+
+def _first_column(cursor: sqlite3.Cursor, row: tuple):
+    """Row factory returning the first column of a row"""
+    return row[0]
+
+
+def _list_session_ids(cursor: sqlite3.Cursor, username: str) -> list:
+    """Return the session IDs of a user, newest first, using an open cursor"""
+    # Dedicated cursor yielding the bare session_id instead of a 1-tuple row
+    ids_cursor = cursor.connection.cursor()
+    ids_cursor.row_factory = _first_column
+    return ids_cursor.execute(_SQL_LIST_SESSIONS, (username,)).fetchall()
+
+
 def get_session_ids_from_db(username: str) -> gr.update:
     """
     Retrieve all session IDs for a given user from the database.
 
-    This function connects to the SQLite database defined in `settings.DB_FILE`,
-    ensures the database directory exists, checks if the `agent_sessions` table
-    exists, and fetches all session IDs associated with the specified username.
+    This function uses the shared connection to the SQLite database defined in
+    `settings.DB_FILE`, ensures the database directory exists, checks if the `agent_sessions` table
+    exists (only until it is found), and fetches all session IDs associated with the specified username.
     If the table does not exist or an error occurs, an empty list is returned.
 
     Args:
@@ -47,45 +139,174 @@ def get_session_ids_from_db(username: str) -> gr.update:
     Returns:
         gr.update: A Gradio update object containing the list of session IDs (reversed order).
     """
+    global _table_checked
     session_ids = []
     try:
-        # Ensure the tmp directory exists
-        ensure_tmp_directory(settings.DB_FILE)
-
-        # Connect to the database
-        conn = sqlite3.connect(settings.DB_FILE)
-        cursor = conn.cursor()
-
-        # Check if the agent_sessions table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='agent_sessions';
-        """)
-        table_exists = cursor.fetchone()
-
-        if table_exists:
-            # Fetch all session IDs
-            cursor.execute(
-                """
-                SELECT session_id FROM agent_sessions
-                WHERE user_id = ?
-            """,
-                (username,),
-            )
-            session_ids = [row[0] for row in cursor.fetchall()]
-        else:
-            print(
-                f"{Fore.YELLOW}Warning: Table 'agent_sessions' does not exist in {settings.DB_FILE}{Fore.RESET}"
-            )
+        with db_lock:
+            # Shared connection (ensures the tmp directory exists)
+            cursor = get_db_connection().cursor()
+
+            # Check if the agent_sessions table exists - once it is created it stays
+            if not _table_checked:
+                cursor.execute(_SQL_TABLE_CHECK)
+                _table_checked = cursor.fetchone() is not None
 
-        conn.close()
+            if _table_checked:
+                _ensure_indexes(cursor)
+
+                # Fetch all session IDs
+                session_ids = _list_session_ids(cursor, username)
+            else:
+                print(
+                    f"{Fore.YELLOW}Warning: Table 'agent_sessions' does not exist in {settings.DB_FILE}{Fore.RESET}"
+                )
 
     except sqlite3.Error as e:
         print(f"{Fore.RED}Database error: {e}{Fore.RESET}")
     except Exception as e:
         print(f"{Fore.RED}Unexpected error while fetching sessions: {e}{Fore.RESET}")
 
-    return gr.update(choices=session_ids[::-1])
+    return gr.update(choices=session_ids)
+
+
+@lru_cache(maxsize=32)
+def fetch_session_runs(session_id: str, username: str, version: int) -> list:
+    """
+    Fetch and decode the stored runs of a session from the database.
+
+    The result is cached by `version` (the session last update time, set by agno on
+    every write), so toggling display options on the same session does not reload
+    it from disk.
+
+    Args:
+        session_id (str): The session identifier whose runs should be loaded.
+        username (str): The user ID associated with the session.
+        version (int): The session `updated_at` used as cache key.
+
+    Returns:
+        list: The decoded session runs, or an empty list if the session has no runs.
+    """
+    with db_lock:
+        cursor = get_db_connection().cursor()
+
+        cursor.execute(_SQL_LOAD_RUN, (session_id, username))
+        result = cursor.fetchone()
+
+    if result is None or not result[0]:
+        return []
+
+    # Runs are stored as a JSON-encoded JSON string
+    try:
+        return orjson.loads(orjson.loads(result[0]))
+    except orjson.JSONDecodeError:
+        # Written with json.dumps, which allows NaN/Infinity and lone surrogates (rejected by orjson)
+        return json.loads(json.loads(result[0]))
+
+
+def render_session_history(
+    runs: list, chat_event_metadata_radio: str, latex_mode_radio: str
+) -> list:
+    """
+    Rebuild the chat history of a session from its decoded runs.
+
+    Execution times for tool calls are calculated using Unix timestamps from
+    tool-related events. Duplicate messages (same role and content) are skipped
+    while building, preserving order. Messages are gathered as plain
+    `(role, content, metadata)` tuples and converted to `ChatMessage` at the end.
+
+    Args:
+        runs (list): The decoded session runs.
+        chat_event_metadata_radio (str): "ON" to include tool metadata, otherwise ignored.
+        latex_mode_radio (str): "ON" to eneble standard LaTeX and "OFF" for default.
+
+    Returns:
+        List[ChatMessage]: The session history as ChatMessage objects.
+    """
+    # (role, content, metadata) of each message to render
+    raw_history = []
+    # (role, content) of the messages already added
+    seen = set()
+
+    def add_message(role: str, content: str | None, metadata: dict | None = None):
+        """Append a message unless the same (role, content) was already added"""
+        content = content if content is not None else ""
+        key = (role, content)
+        if key not in seen:
+            seen.add(key)
+            raw_history.append((role, content, metadata))
+
+    show_metadata = chat_event_metadata_radio == "ON"
+
+    for run in runs:
+        messages = run.get("messages", [])
+
+        # Metadata disabled - user and assistant messages only, events are not needed
+        if not show_metadata:
+            for msg in messages:
+                role = msg.get("role")
+                if role in ["user", "assistant"]:
+                    add_message(role, msg.get("content", ""))
+            continue
+
+        events = run.get("events", [])
+
+        # Create mappings tool_call_id -> start_timestamp | end_timestamp
+        starts = {
+            e["tool"]["tool_call_id"]: e["created_at"]
+            for e in events
+            if e.get("event") == "ToolCallStarted" and e.get("tool", {}).get("tool_call_id")
+        }
+        ends = {
+            e["tool"]["tool_call_id"]: e["created_at"]
+            for e in events
+            if e.get("event") == "ToolCallCompleted" and e.get("tool", {}).get("tool_call_id")
+        }
+
+        for msg in messages:
+            role = msg.get("role")
+
+            # Tool metadata
+            if role == "tool":
+                content = msg.get("content", "")
+                tool_name = msg.get("tool_name")
+                tool_args = msg.get("tool_args")
+                tool_call_id = msg.get("tool_call_id")
+
+                start = starts.get(tool_call_id)
+                end = ends.get(tool_call_id)
+                exec_time = f"{end - start:.3f}s" if start is not None and end is not None else "N/A"
+
+                # ToolCallStarted
+                custom_content_started = (
+                    f"\n**Tool:** `{tool_name}`\n**Arguments:** `{tool_args}`\n"
+                )
+                add_message("assistant", custom_content_started, _META_STARTED)
+
+                # ToolCallCompleted
+                content = _NORMALIZE.get(type(content), str)(content)
+                result_text = content.strip() if content else ""
+                custom_content_completed = (
+                    f"**Results:**\n{result_text}\n**Execution time:** {exec_time}"
+                )
+                add_message("assistant", custom_content_completed, _META_COMPLETED)
+
+            elif role in ["user", "assistant"]:
+                add_message(role, msg.get("content", ""))
+
+    # Trigger LaTeX on message by renew session history
+    if latex_mode_radio == "ON":
+        for i in range(len(raw_history) - 1, -1, -1):
+            role, content, metadata = raw_history[i]
+            if role == "assistant":
+                raw_history[i] = (role, content + " ", metadata)
+                break
+
+    return [
+        ChatMessage(role=role, content=content, metadata=metadata)
+        if metadata
+        else ChatMessage(role=role, content=content)
+        for role, content, metadata in raw_history
+    ]
 
 
 def load_sessions_history(
@@ -102,9 +323,8 @@ def load_sessions_history(
     as a list of `ChatMessage` objects. If `chat_event_metadata_radio` is "ON",
     tool call metadata (tool name, arguments, and execution time) is included.
 
-    Execution times for tool calls are calculated using Unix timestamps from
-    tool-related events. Duplicate messages (same role and content) are removed
-    while preserving order.
+    The decoded runs are cached by the session last update, so toggling the
+    metadata or LaTeX options only re-renders the history.
 
     Args:
         session_id (str): The session identifier whose history should be loaded.
@@ -135,112 +355,21 @@ def load_sessions_history(
         ]
         
     try:
-        ensure_tmp_directory(settings.DB_FILE)
-        conn = sqlite3.connect(settings.DB_FILE)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT runs FROM agent_sessions 
-            WHERE session_id = ? AND user_id = ?
-        """,
-            (session_id, username),
-        )
-        result = cursor.fetchone()
-        conn.close()
+        with db_lock:
+            cursor = get_db_connection().cursor()
 
-        if result is None or not result[0]:
-            return ([], gr.update(min_height=350, max_height=350))
-
-        memory = json.loads(json.loads(result[0]))
-        runs = memory
-        chat_history = []
-
-        for run in runs:
-            messages = run.get("messages", [])
-            events = run.get("events", [])
+            # Check the session version without reading its runs
+            cursor.execute(_SQL_SESSION_VERSION, (session_id, username))
+            row = cursor.fetchone()
 
-            # Create a mapping tool_call_id -> (start_timestamp, end_timestamp)
-            tool_times = {}
-            for event in events:
-                tool_call_id = event.get("tool", {}).get("tool_call_id")
-                if not tool_call_id:
-                    continue
-                if tool_call_id not in tool_times:
-                    tool_times[tool_call_id] = {"start": None, "end": None}
-
-                if event["event"] == "ToolCallStarted":
-                    tool_times[tool_call_id]["start"] = event["created_at"]
-                elif event["event"] == "ToolCallCompleted":
-                    tool_times[tool_call_id]["end"] = event["created_at"]
+        if row is None:
+            return ([], gr.update(min_height=350, max_height=350))
 
-            for msg in messages:
-                role = msg.get("role")
-                content = msg.get("content", "")
-                tool_name = msg.get("tool_name")
-                tool_args = msg.get("tool_args")
-                tool_call_id = msg.get("tool_call_id")
+        runs = fetch_session_runs(session_id, username, row[0])
+        if not runs:
+            return ([], gr.update(min_height=350, max_height=350))
 
-                # Show tool metadata only if enabled
-                if chat_event_metadata_radio == "ON" and role == "tool":
-                    exec_time = "N/A"
-                    if tool_call_id in tool_times:
-                        start = tool_times[tool_call_id]["start"]
-                        end = tool_times[tool_call_id]["end"]
-                        if start is not None and end is not None:
-                            exec_time = f"{end - start:.3f}s"
-
-                    # ToolCallStarted
-                    custom_content_started = (
-                        f"\n**Tool:** `{tool_name}`\n**Arguments:** `{tool_args}`\n"
-                    )
-                    chat_history.append(
-                        ChatMessage(
-                            role="assistant",
-                            content=custom_content_started,
-                            metadata={"title": "🛠️ ToolCallStarted"},
-                        )
-                    )
-
-                    # ToolCallCompleted
-                    if isinstance(content, list):
-                        content = "\n".join(str(item).strip() for item in content if item)
-                    elif not isinstance(content, str):
-                        content = str(content)
-                    result_text = content.strip() if content else ""
-                    custom_content_completed = (
-                        f"**Results:**\n{result_text}\n**Execution time:** {exec_time}"
-                    )
-                    chat_history.append(
-                        ChatMessage(
-                            role="assistant",
-                            content=custom_content_completed,
-                            metadata={"title": "🛠️ ToolCallCompleted"},
-                        )
-                    )
-
-                elif role in ["user", "assistant"]:
-                    chat_history.append(
-                        ChatMessage(
-                            role=role, content=content if content is not None else ""
-                        )
-                    )
-                    
-                # Trigger LaTeX on message by renew session history
-                if latex_mode_radio == "ON":
-                     for msg in reversed(chat_history):
-                        if msg.role == "assistant":
-                            msg.content += " "
-                            break
-                        
-        # Remove duplicates while maintaining order
-        seen = set()
-        unique_history = []
-        for msg in chat_history:
-            identifier = (msg.role, msg.content)
-            if identifier not in seen:
-                seen.add(identifier)
-                unique_history.append(msg)
+        unique_history = render_session_history(runs, chat_event_metadata_radio, latex_mode_radio)
 
         return (unique_history, gr.update(min_height=650, max_height=650, latex_delimiters=latex_var))
 
@@ -261,7 +390,9 @@ def delete_session_from_db(
     This function removes the session with the given `session_id` for the specified
     `username` from the `agent_sessions` table. It ensures the database directory exists,
     handles potential errors, and prints informative messages. After deletion, it
-    returns updated session IDs and UI updates for Gradio components.
+    lists the remaining session IDs with the same cursor and returns them with UI
+    updates for Gradio components. The session list is left unchanged when nothing
+    was deleted.
 
     Args:
         session_id (str): The session ID to delete.
@@ -278,31 +409,26 @@ def delete_session_from_db(
             print(f"{Fore.YELLOW}No session selected for deletion{Fore.RESET}")
             gr.Warning("No session selected for deletion.", duration=2)
             return (
-                get_session_ids_from_db(username),          # Update session_radio
+                gr.update(),                                # Keep session_radio
                 [],                                         # Clean chatbot
                 gr.update(min_height=350, max_height=350),  # Adjust chatbot layout
             )
 
-        ensure_tmp_directory(settings.DB_FILE)
-        conn = sqlite3.connect(settings.DB_FILE)
-        cursor = conn.cursor()
-
-        # Delete the session
-        cursor.execute(
-            """
-            DELETE FROM agent_sessions
-            WHERE session_id = ? AND user_id = ?
-        """,
-            (session_id, str(username)),
-        )
-        conn.commit()
-        conn.close()
+        with db_lock:
+            conn = get_db_connection()
+
+            # Delete the session and list the remaining ones in one transaction
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN")
+                cursor.execute(_SQL_DELETE_ONE, (session_id, str(username)))
+                session_ids = _list_session_ids(cursor, username)
 
         print(f"{Fore.GREEN}Deleted session: {session_id}{Fore.RESET}")       
         gr.Success("Deleted session.", duration=2)
 
         return (
-            get_session_ids_from_db(username),              # Update session_radio
+            gr.update(choices=session_ids),                 # Update session_radio
             [],                                             # Clean chatbot
             gr.update(min_height=350, max_height=350),      # Adjust chatbot layout
         )
@@ -311,7 +437,7 @@ def delete_session_from_db(
         print(f"{Fore.RED}Database error deleting session: {e}{Fore.RESET}")
         gr.Error("Database error deleting session.", duration=2)
         return (
-            get_session_ids_from_db(username),              
+            gr.update(),              
             [],                                             
             gr.update(min_height=350, max_height=350),      
         )
@@ -319,7 +445,7 @@ def delete_session_from_db(
         print(f"{Fore.RED}Unexpected error deleting session: {e}{Fore.RESET}")
         gr.Error("Unexpected error deleting session.", duration=2)
         return (
-            get_session_ids_from_db(username),              
+            gr.update(),              
             [],                                             
             gr.update(min_height=350, max_height=350),      
         )
@@ -344,20 +470,11 @@ def delete_all_sessions_from_db(username: str) -> Tuple[gr.update, list, gr.upda
             - Gradio update object to hide the modal.
     """
     try:
-        ensure_tmp_directory(settings.DB_FILE)
-        conn = sqlite3.connect(settings.DB_FILE)
-        cursor = conn.cursor()
-
-        # Delete all sessions for the given user_id
-        cursor.execute(
-            """
-            DELETE FROM agent_sessions
-            WHERE user_id = ?
-        """,
-            (username,),
-        )
-        conn.commit()
-        conn.close()
+        with db_lock:
+            cursor = get_db_connection().cursor()
+
+            # Delete all sessions for the given user_id
+            cursor.execute(_SQL_DELETE_ALL, (username,))
 
         print(f"{Fore.GREEN}Deleted ALL sessions{Fore.RESET}")
         gr.Success("Deleted ALL sessions.", duration=2)
@@ -373,7 +490,7 @@ def delete_all_sessions_from_db(username: str) -> Tuple[gr.update, list, gr.upda
         gr.Error("Database error deleting all sessions.", duration=2)
         
         return (
-            get_session_ids_from_db(settings.DB_FILE),
+            gr.update(),
             [],
             gr.update(visible=False),
         )
@@ -382,7 +499,7 @@ def delete_all_sessions_from_db(username: str) -> Tuple[gr.update, list, gr.upda
         gr.Error("Unexpected error deleting all sessions.", duration=2)
         
         return (
-            get_session_ids_from_db(settings.DB_FILE),
+            gr.update(),
             [],
             gr.update(visible=False),
         )
@@ -399,11 +516,8 @@ def get_unique_session_id() -> str:
     Returns:
         str: A unique session identifier string.
     """
-    timestamp = datetime.now().strftime("%d-%m-%Y_%H:%M:%S")
-    parts = str(uuid.uuid4()).split("-")
-    short_hash = "-".join(parts[:4])
-    unique_id = f"{timestamp}___{short_hash}"
-    return unique_id
+    # First four UUID groups (8-4-4-4 characters) as the short hash
+    return f"{datetime.now():%d-%m-%Y_%H:%M:%S}___{str(uuid.uuid4())[:23]}"
 
 
 def clear_and_start_new_session() -> Tuple[str, str, None, gr.update, gr.update, None]:
@@ -0,0 +1,12 @@
+# Open-LLM-webchat - Tests setup
+import os
+import sys
+import tempfile
+
+from pathlib import Path
+
+# App modules are imported from src, as when running src/app.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# App databases use relative "tmp/" paths - keep them out of the repository
+os.chdir(tempfile.mkdtemp(prefix="open-llm-webchat-tests-"))
@@ -0,0 +1,60 @@
+# Open-LLM-webchat - Agent cache tests
+import asyncio
+
+from utils.agent import get_agent, release_agent
+
+
+def get_session_agent(long_term_memory_selector: str):
+    """Return the cached agent of the test session for the given long-term memory option"""
+    return asyncio.run(
+        get_agent(
+            knowledge_base_selector="OFF",
+            knowledge_base_path=None,
+            selected_model="Groq_openai/gpt-oss-20b",
+            temperature=0.5,
+            top_p=0.9,
+            top_k=40,
+            max_tokens_number=1024,
+            short_term_memory_selector="ON",
+            long_term_memory_selector=long_term_memory_selector,
+            short_memory_history_runs=3,
+            chat_event_reasoning=None,
+            username="user_test",
+            session_id="session_test",
+        )
+    )
+
+
+def test_long_term_memory_off_on_cached_agent():
+    agent = get_session_agent("ON")
+
+    # A memory-enabled run leaves a memory manager on the agent
+    agent.initialize_agent()
+    assert agent.memory_manager is not None
+    release_agent(agent)
+
+    agent_off = get_session_agent("OFF")
+    release_agent(agent_off)
+    assert agent_off is agent
+    assert agent_off.enable_user_memories is False
+    assert agent_off.memory_manager is None
+
+    # The next run must not bring the memory manager back
+    agent_off.initialize_agent()
+    assert agent_off.memory_manager is None
+
+
+def test_busy_agent_is_not_reconfigured():
+    agent = get_session_agent("ON")
+
+    # A second turn on the same session while the first one is running
+    concurrent_agent = get_session_agent("OFF")
+    assert concurrent_agent is not agent
+    assert agent.enable_user_memories is True
+
+    release_agent(agent)
+    release_agent(concurrent_agent)
+
+    # The latest agent is kept for the session once free
+    assert get_session_agent("ON") is concurrent_agent
+    release_agent(concurrent_agent)